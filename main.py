@@ -1,102 +1,182 @@
+import atexit
+import gzip
 import json
 import os
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
 
-# =================== MODELOS ===================
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+SECTIONS = ("authors", "categories", "articles")
+GZIP_MIN_SIZE = 18
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+
+_ansi_supported = None
+
+
+def enable_vt_mode():
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | ENABLE_VIRTUAL_TERMINAL_PROCESSING))
+    except (AttributeError, OSError):
+        return False
+
+
+def clear_screen():
+    global _ansi_supported
+    if _ansi_supported is None:
+        _ansi_supported = os.name != "nt" or enable_vt_mode()
+    if _ansi_supported:
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
+    else:
+        os.system("cls")
+
+
+def json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def gzip_uncompressed_size(filepath):
+    with open(filepath, "rb") as file:
+        compressed = file.seek(0, os.SEEK_END)
+        if compressed < GZIP_MIN_SIZE:
+            raise ValueError(f"{filepath}: truncated gzip catalog ({compressed} bytes)")
+        file.seek(-4, os.SEEK_END)
+        isize = int.from_bytes(file.read(4), "little")
+    # ISIZE is the uncompressed length modulo 2**32 and wraps at 4 GiB. Catalogs that
+    # large still compress to well above STREAM_THRESHOLD, so taking the larger of the
+    # two keeps them on the streaming path.
+    return max(isize, compressed)
+
+
+def json_iter_sections(file):
+    prefixes = {f"{name}.item": name for name in SECTIONS}
+    builder = None
+    section = None
+    for prefix, event, value in ijson.parse(file, use_float=True):
+        if builder is None:
+            if event == "number" and prefix == "generation":
+                yield "generation", value
+            elif event == "start_map" and prefix in prefixes:
+                section = prefixes[prefix]
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            continue
+        builder.event(event, value)
+        if event == "end_map" and prefix == f"{section}.item":
+            yield section, builder.value
+            builder = None
 
-class Author:
-    def __init__(self, name: str, email: str):
-        self.__name = name
-        self.__email = email
-        self.__articles = []
 
-    @property
-    def name(self):
-        return self.__name
+# =================== MODELOS ===================
 
-    @property
-    def email(self):
-        return self.__email
+@dataclass(slots=True, eq=False)
+class Author:
+    name: str
+    email: str
 
-    def add_article(self, article):
-        self.__articles.append(article)
+    def to_dict(self):
+        return {"name": self.name, "email": self.email}
 
     def __str__(self):
-        return f"Author: {self.__name} ({self.__email})"
+        return f"Author: {self.name} ({self.email})"
 
 
+@dataclass(slots=True, eq=False)
 class Category:
-    def __init__(self, name: str):
-        self.__name = name
-        self.__articles = []
+    name: str
 
-    @property
-    def name(self):
-        return self.__name
-
-    def add_article(self, article):
-        self.__articles.append(article)
+    def to_dict(self):
+        return {"name": self.name}
 
     def __str__(self):
-        return f"Category: {self.__name}"
+        return f"Category: {self.name}"
 
 
+@dataclass(slots=True, eq=False)
 class Article:
-    def __init__(self, title: str, content: str, author: Author, category: Category):
-        self.__title = title
-        self.__content = content
-        self.__author = author
-        self.__category = category
-        self.__published_at = None
-
-        author.add_article(self)
-        category.add_article(self)
-
-    @property
-    def title(self):
-        return self.__title
-
-    @property
-    def content(self):
-        return self.__content
-
-    @property
-    def author(self):
-        return self.__author
-
-    @property
-    def category(self):
-        return self.__category
+    title: str
+    content: str
+    author: Author
+    category: Category
+    published_str: str | None = None
+    _published_at: datetime | None = field(default=None, init=False, repr=False)
 
     @property
     def published_at(self):
-        return self.__published_at
+        if self._published_at is None and self.published_str is not None:
+            try:
+                self._published_at = datetime.fromisoformat(self.published_str)
+            except ValueError:
+                return None
+        return self._published_at
 
     def publish(self):
-        self.__published_at = datetime.now()
+        now = datetime.now()
+        self._published_at = now
+        self.published_str = now.strftime("%Y-%m-%d %H:%M:%S")
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "content": self.content,
+            "author": self.author.email,
+            "category": self.category.name,
+            "published_at": self.published_str
+        }
 
     def __str__(self):
-        return f"Article: {self.__title} by {self.__author.name} in {self.__category.name} (Published: {self.__published_at})"
+        return f"Article: {self.title} by {self.author.name} in {self.category.name} (Published: {self.published_at or self.published_str})"
 
 
 # =================== FACTORIES ===================
 
 class EntityFactory:
     @staticmethod
-    def get_or_create_author(name: str, email: str, authors: dict):
-        if email in authors:
-            return authors[email]
+    def get_or_create_author(name: str, email: str, authors: dict) -> tuple[Author, bool]:
+        author = authors.get(email)
+        if author is not None:
+            return author, False
+        email = sys.intern(email)
         author = Author(name, email)
         authors[email] = author
-        return author
+        return author, True
 
     @staticmethod
-    def get_or_create_category(name: str, categories: dict):
-        if name in categories:
-            return categories[name]
+    def get_or_create_category(name: str, categories: dict) -> tuple[Category, bool]:
+        category = categories.get(name)
+        if category is not None:
+            return category, False
+        name = sys.intern(name)
         category = Category(name)
         categories[name] = category
-        return category
+        return category, True
 
 
 class ArticleFactory:
@@ -106,73 +186,278 @@ class ArticleFactory:
         article.publish()
         return article
 
+    @staticmethod
+    def restore_article(title: str, content: str, author: Author, category: Category, published_at: str) -> Article:
+        return Article(title, content, author, category, published_at)
+
 
 # =================== FACADE ===================
 
 class CatalogManager:
+    COMPACT_THRESHOLD = 1000
+    STREAM_THRESHOLD = 10 * 1024 * 1024
+    COMPRESS_LEVEL = 6
+    WRITE_BUFFER_SIZE = 128 * 1024
+
     def __init__(self, filepath="database.json"):
-        self.filepath = filepath
-        self.data = self.load()
-        self.authors = {a["email"]: Author(a["name"], a["email"]) for a in self.data["authors"]}
-        self.categories = {c["name"]: Category(c["name"]) for c in self.data["categories"]}
+        self.filepath = filepath if filepath.endswith(".gz") else filepath + ".gz"
+        self.legacy_filepath = self.filepath[:-len(".gz")]
+        self.log_filepath = os.path.splitext(self.legacy_filepath)[0] + ".log"
+        self._log = None
+        self._log_entries = 0
+        self._write_buf = bytearray()
+        self._dirty = False
+        self._loaded = False
+        self._generation = 0
+        self.authors = {}
+        self.categories = {}
+        self.articles = []
+        self._by_author = {}
+        self._by_category = {}
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        generation = 0
+        authors = {}
+        categories = {}
+        articles = []
+        unlisted_authors = {}
+        unlisted_categories = {}
+        for section, item in self.load():
+            if section == "generation":
+                generation = item
+            elif section == "authors":
+                EntityFactory.get_or_create_author(item["name"], item["email"], authors)
+            elif section == "categories":
+                EntityFactory.get_or_create_category(item["name"], categories)
+            else:
+                author = authors.get(item["author"])
+                if author is None:
+                    author = unlisted_authors.setdefault(item["author"], Author(item["author"], item["author"]))
+                category = categories.get(item["category"])
+                if category is None:
+                    category = unlisted_categories.setdefault(item["category"], Category(item["category"]))
+                articles.append(ArticleFactory.restore_article(
+                    item["title"], item["content"], author, category, item["published_at"]
+                ))
+
+        # only publish the catalog once the whole file and log have been read
+        self._generation = generation
+        self.authors = authors
+        self.categories = categories
+        for article in articles:
+            self._index_article(article)
+        if os.path.exists(self.legacy_filepath):
+            self._dirty = True
+        self._loaded = True
+
+    def _open_catalog(self):
+        try:
+            size = gzip_uncompressed_size(self.filepath)
+        except FileNotFoundError:
+            pass
+        else:
+            return gzip.open(self.filepath, "rb"), size
+        try:
+            file = open(self.legacy_filepath, "rb")
+        except FileNotFoundError:
+            return None, 0
+        return file, os.path.getsize(self.legacy_filepath)
 
     def load(self):
+        generation = 0
+        for section, item in self._load_snapshot():
+            if section == "generation":
+                generation = item
+            yield section, item
+        yield from self._replay_log(generation)
+
+    def _load_snapshot(self):
+        file, size = self._open_catalog()
+        if file is None:
+            return
+        with file:
+            if ijson is not None and size > self.STREAM_THRESHOLD:
+                yield from json_iter_sections(file)
+                return
+            data = json_loads(file.read())
+        yield "generation", data.get("generation", 0)
+        for section in SECTIONS:
+            for item in data.get(section, []):
+                yield section, item
+
+    def _replay_log(self, generation):
         try:
-            with open(self.filepath, "r") as file:
-                return json.load(file)
+            file = open(self.log_filepath, "rb")
         except FileNotFoundError:
-            return {"authors": [], "categories": [], "articles": []}
+            return
+        with file:
+            lines = file.readlines()
+
+        entries = []
+        offset = 0
+        for number, line in enumerate(lines, start=1):
+            try:
+                entries.append(json_loads(line))
+            except ValueError as exc:
+                if number < len(lines):
+                    raise ValueError(f"{self.log_filepath}: corrupt record on line {number}") from exc
+                # torn final write: drop it so the next append starts on a clean line
+                os.truncate(self.log_filepath, offset)
+                break
+            offset += len(line)
+            if not line.endswith(b"\n"):
+                # complete record that lost only its newline: terminate it before appending
+                with open(self.log_filepath, "ab") as log:
+                    log.write(b"\n")
+                    log.flush()
+                    os.fsync(log.fileno())
+
+        self._log_entries = len(entries)
+        for entry in entries:
+            # records stamped with a generation the snapshot already has were folded in
+            # by a compaction that crashed before removing the log
+            if entry.get("generation", generation + 1) <= generation:
+                continue
+            if "author" in entry:
+                yield "authors", entry["author"]
+            if "category" in entry:
+                yield "categories", entry["category"]
+            yield "articles", entry["article"]
+
+    def _append_log(self, *chunks):
+        if self._log is None:
+            self._log = open(self.log_filepath, "ab")
+        self._log.write(self._fill_buffer(*chunks, b"\n"))
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._release_buffer()
+        self._log_entries += 1
+
+    def _fill_buffer(self, *chunks):
+        buf = self._write_buf
+        buf[:] = chunks[0]
+        for chunk in chunks[1:]:
+            buf += chunk
+        return buf
+
+    def _release_buffer(self):
+        if len(self._write_buf) > self.WRITE_BUFFER_SIZE * 2:
+            self._write_buf = bytearray()
+
+    def to_dict(self):
+        self._ensure_loaded()
+        return {
+            "authors": [a.to_dict() for a in self.authors.values()],
+            "categories": [c.to_dict() for c in self.categories.values()],
+            "articles": [a.to_dict() for a in self.articles]
+        }
+
+    def _serialize(self, generation):
+        return json_dumps({"generation": generation, **self.to_dict()})
 
     def save(self):
-        with open(self.filepath, "w") as file:
-            json.dump(self.data, file, indent=4)
+        self._ensure_loaded()
+        generation = self._generation + 1
+        data = gzip.compress(self._serialize(generation), compresslevel=self.COMPRESS_LEVEL)
+        tmp = self.filepath + ".tmp"
+        with open(tmp, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, self.filepath)
+        self._generation = generation
+        if os.path.exists(self.legacy_filepath):
+            os.remove(self.legacy_filepath)
+        self._dirty = False
+
+    def compact(self):
+        self.save()
+        self.close()
+        if os.path.exists(self.log_filepath):
+            os.remove(self.log_filepath)
+        self._log_entries = 0
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def export_pretty(self, filepath=None):
+        if filepath is None:
+            filepath = os.path.splitext(self.legacy_filepath)[0] + ".pretty.json"
+        with open(filepath, "wb") as file:
+            file.write(json_dumps(self.to_dict(), pretty=True))
+        return filepath
+
+    def flush(self):
+        if self._dirty or self._log_entries:
+            self.compact()
 
     def add_article(self, name, email, category_name, title, content):
-        author = EntityFactory.get_or_create_author(name, email, self.authors)
-        category = EntityFactory.get_or_create_category(category_name, self.categories)
+        self._ensure_loaded()
+        author, new_author = EntityFactory.get_or_create_author(name, email, self.authors)
+        category, new_category = EntityFactory.get_or_create_category(category_name, self.categories)
         article = ArticleFactory.create_article(title, content, author, category)
 
-        if not any(a["email"] == author.email for a in self.data["authors"]):
-            self.data["authors"].append({"name": author.name, "email": author.email})
-
-        if not any(c["name"] == category.name for c in self.data["categories"]):
-            self.data["categories"].append({"name": category.name})
-
-        self.data["articles"].append({
-            "title": article.title,
-            "content": article.content,
-            "author": author.email,
-            "category": category.name,
-            "published_at": article.published_at.strftime("%Y-%m-%d %H:%M:%S")
-        })
-
-        self.save()
+        self._index_article(article)
+
+        chunks = [
+            b'{"generation":', str(self._generation + 1).encode(),
+            b',"article":', json_dumps(article.to_dict())
+        ]
+        if new_author:
+            chunks += (b',"author":', json_dumps(author.to_dict()))
+        if new_category:
+            chunks += (b',"category":', json_dumps(category.to_dict()))
+        chunks.append(b"}")
+        self._append_log(*chunks)
+        if self._log_entries >= self.COMPACT_THRESHOLD:
+            self.compact()
         return article
 
+    def _index_article(self, article):
+        self.articles.append(article)
+        self._by_author.setdefault(article.author.email, []).append(article)
+        self._by_category.setdefault(article.category.name, []).append(article)
+
     def show_catalog(self):
+        self._ensure_loaded()
         print("\n=== CATÁLOGO ===")
 
-        print("\n🧠 Autores:")
-        for author in self.data.get("authors", []):
-            print(f"- {author['name']} ({author['email']})")
+        write = sys.stdout.write
+        write("\n".join(["\n🧠 Autores:"] + [
+            f"- {author.name} ({author.email})" for author in self.authors.values()
+        ]) + "\n")
 
-        print("\n📁 Categorias:")
-        for category in self.data.get("categories", []):
-            print(f"- {category['name']}")
+        write("\n".join(["\n📁 Categorias:"] + [
+            f"- {category.name}" for category in self.categories.values()
+        ]) + "\n")
 
-        print("\n📝 Artigos:")
-        for article in self.data.get("articles", []):
-            print(f"- '{article['title']}' por {article['author']} em {article['category']} ({article['published_at']})")
+        write("\n".join(["\n📝 Artigos:"] + [
+            f"- '{article.title}' por {article.author.email} em {article.category.name} ({article.published_str})"
+            for article in self.articles
+        ]) + "\n")
 
     def list_articles(self):
-        return self.data.get("articles", [])
+        self._ensure_loaded()
+        return self.articles
+
+    def articles_by_author(self, email):
+        self._ensure_loaded()
+        return list(self._by_author.get(email, ()))
+
+    def articles_by_category(self, name):
+        self._ensure_loaded()
+        return list(self._by_category.get(name, ()))
 
     def show_article(self, index):
-        articles = self.data.get("articles", [])
-        if 0 <= index < len(articles):
-            a = articles[index]
+        self._ensure_loaded()
+        if 0 <= index < len(self.articles):
+            a = self.articles[index]
             print("\n=== ARTIGO SELECIONADO ===")
-            print(f"Título: {a['title']}\nAutor: {a['author']}\nCategoria: {a['category']}\nPublicado em: {a['published_at']}\n\nConteúdo:\n{a['content']}")
+            print(f"Título: {a.title}\nAutor: {a.author.email}\nCategoria: {a.category.name}\nPublicado em: {a.published_str}\n\nConteúdo:\n{a.content}")
 
 
 # =================== COMMANDS ===================
@@ -187,7 +472,7 @@ class ShowCatalogCommand(Command):
         self.manager = manager
 
     def execute(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        clear_screen()
         self.manager.show_catalog()
         input("\nPressione ENTER para voltar ao menu.")
 
@@ -197,7 +482,7 @@ class AddArticleCommand(Command):
         self.manager = manager
 
     def execute(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        clear_screen()
         name = input("Nome do autor: ")
         email = input("Email do autor: ")
         category = input("Nome da categoria: ")
@@ -213,16 +498,16 @@ class ReadArticleCommand(Command):
         self.manager = manager
 
     def execute(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        clear_screen()
         artigos = self.manager.list_articles()
         if not artigos:
             print("Nenhum artigo cadastrado.")
             input("\nPressione ENTER para voltar.")
             return
 
-        print("=== LISTA DE ARTIGOS ===")
-        for i, artigo in enumerate(artigos, start=1):
-            print(f"{i}. {artigo['title']} (por {artigo['author']})")
+        sys.stdout.write("\n".join(["=== LISTA DE ARTIGOS ==="] + [
+            f"{i}. {artigo.title} (por {artigo.author.email})" for i, artigo in enumerate(artigos, start=1)
+        ]) + "\n")
 
         try:
             escolha = int(input("\nNúmero do artigo: "))
@@ -233,30 +518,48 @@ class ReadArticleCommand(Command):
         input("\nPressione ENTER para voltar ao menu.")
 
 
+class ExportPrettyCommand(Command):
+    def __init__(self, manager: CatalogManager):
+        self.manager = manager
+
+    def execute(self):
+        clear_screen()
+        filepath = self.manager.export_pretty()
+        print(f"✅ Catálogo exportado para {filepath}")
+        input("\nPressione ENTER para voltar ao menu.")
+
+
 # =================== MAIN ===================
 
+COMMANDS = (None, ShowCatalogCommand, AddArticleCommand, ReadArticleCommand, ExportPrettyCommand)
+
+
 def main():
     manager = CatalogManager()
-    commands = {
-        '1': ShowCatalogCommand(manager),
-        '2': AddArticleCommand(manager),
-        '3': ReadArticleCommand(manager)
-    }
+    atexit.register(manager.flush)
+    commands = tuple(command and command(manager) for command in COMMANDS)
 
     while True:
-        os.system('cls' if os.name == 'nt' else 'clear')
+        clear_screen()
         print("=== MENU PRINCIPAL ===")
         print("1. Ver Catálogo")
         print("2. Adicionar Artigo")
         print("3. Ler Artigo")
+        print("4. Exportar Catálogo")
         print("0. Sair")
 
         opcao = input("\nEscolha uma opção: ")
 
-        if opcao == '0':
+        try:
+            idx = int(opcao)
+        except ValueError:
+            idx = -1
+
+        if idx == 0:
+            manager.flush()
             break
-        elif opcao in commands:
-            commands[opcao].execute()
+        elif 0 < idx < len(commands):
+            commands[idx].execute()
         else:
             print("Opção inválida.")
             input("\nPressione ENTER para continuar.")
@@ -0,0 +1,187 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+import main
+from main import CatalogManager, json_dumps
+
+
+class ArticleLogRecoveryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, "database.json")
+        self.log_filepath = os.path.join(self.tmpdir.name, "database.log")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def manager(self):
+        manager = CatalogManager(self.filepath)
+        self.addCleanup(manager.close)
+        return manager
+
+    def add(self, manager, title):
+        return manager.add_article("Autor", "autor@example.com", "Geral", title, "conteúdo")
+
+    def titles(self):
+        return [a.title for a in self.manager().list_articles()]
+
+    def read_log(self):
+        with open(self.log_filepath, "rb") as file:
+            return file.read()
+
+    def write_log(self, data):
+        with open(self.log_filepath, "wb") as file:
+            file.write(data)
+
+    def test_log_is_replayed_without_compaction(self):
+        manager = self.manager()
+        self.add(manager, "A")
+        self.add(manager, "B")
+        self.assertEqual(self.titles(), ["A", "B"])
+
+    def test_torn_final_record_is_dropped(self):
+        manager = self.manager()
+        self.add(manager, "A")
+        manager.close()
+        intact = self.read_log()
+        self.write_log(intact + b'{"article":{"ti')
+
+        manager = self.manager()
+        self.assertEqual([a.title for a in manager.list_articles()], ["A"])
+        self.assertEqual(self.read_log(), intact)
+        self.add(manager, "B")
+        self.assertEqual(self.titles(), ["A", "B"])
+
+    def test_final_record_without_newline_is_kept(self):
+        manager = self.manager()
+        self.add(manager, "A")
+        manager.close()
+        self.write_log(self.read_log().rstrip(b"\n"))
+
+        manager = self.manager()
+        self.add(manager, "B")
+        self.assertEqual(self.titles(), ["A", "B"])
+
+    def test_corrupt_record_before_the_end_raises(self):
+        manager = self.manager()
+        self.add(manager, "S")
+        manager.compact()
+        self.add(manager, "A")
+        self.add(manager, "B")
+        manager.close()
+        first, second = self.read_log().splitlines(keepends=True)
+        corrupted = first + b"garbage\n" + second
+        self.write_log(corrupted)
+
+        manager = self.manager()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                manager.list_articles()
+        self.assertEqual(manager.authors, {})
+        self.assertEqual(manager.categories, {})
+        self.assertEqual(manager.articles, [])
+        self.assertEqual(manager._by_author, {})
+        self.assertEqual(self.read_log(), corrupted)
+
+    def test_compact_folds_log_into_snapshot(self):
+        manager = self.manager()
+        self.add(manager, "A")
+        manager.compact()
+        self.add(manager, "B")
+        manager.compact()
+        self.assertFalse(os.path.exists(self.log_filepath))
+        self.assertEqual(self.titles(), ["A", "B"])
+
+    def test_crash_between_snapshot_and_log_removal(self):
+        manager = self.manager()
+        self.add(manager, "A")
+        self.add(manager, "B")
+        manager.save()
+        manager.close()
+        self.assertTrue(os.path.exists(self.log_filepath))
+
+        manager = self.manager()
+        self.assertEqual([a.title for a in manager.list_articles()], ["A", "B"])
+        self.add(manager, "C")
+        self.assertEqual(self.titles(), ["A", "B", "C"])
+        manager.compact()
+        self.assertEqual(self.titles(), ["A", "B", "C"])
+
+    def test_snapshot_matches_catalog_across_compactions(self):
+        manager = self.manager()
+        for title in ("A", "B"):
+            self.add(manager, title)
+            manager.compact()
+            with gzip.open(manager.filepath, "rb") as file:
+                self.assertEqual(file.read(), json_dumps({"generation": manager._generation, **manager.to_dict()}))
+
+
+class CatalogMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.legacy_filepath = os.path.join(self.tmpdir.name, "database.json")
+
+    def test_legacy_json_is_migrated_to_gzip(self):
+        legacy = {
+            "authors": [{"name": "Autor", "email": "autor@example.com"}],
+            "categories": [{"name": "Geral"}],
+            "articles": [{
+                "title": "Antigo",
+                "content": "conteúdo",
+                "author": "autor@example.com",
+                "category": "Geral",
+                "published_at": "01/02/2024"
+            }]
+        }
+        with open(self.legacy_filepath, "w", encoding="utf-8") as file:
+            json.dump(legacy, file, indent=4)
+
+        manager = CatalogManager(self.legacy_filepath)
+        article, = manager.list_articles()
+        self.assertEqual(article.published_str, "01/02/2024")
+        self.assertIsNone(article.published_at)
+        manager.flush()
+
+        self.assertFalse(os.path.exists(self.legacy_filepath))
+        with gzip.open(self.legacy_filepath + ".gz", "rb") as file:
+            self.assertEqual(json.loads(file.read())["articles"], legacy["articles"])
+        self.assertEqual(CatalogManager(self.legacy_filepath).to_dict(), legacy)
+
+    def test_truncated_gzip_catalog_raises(self):
+        open(self.legacy_filepath + ".gz", "wb").close()
+        with self.assertRaises(ValueError):
+            CatalogManager(self.legacy_filepath).list_articles()
+
+
+
+@unittest.skipUnless(main.ijson, "ijson is not installed")
+class StreamingLoadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.filepath = os.path.join(self.tmpdir.name, "database.json")
+
+    def test_streamed_load_matches_full_parse(self):
+        manager = CatalogManager(self.filepath)
+        manager.add_article("Autor", "autor@example.com", "Geral", "Olá", "conteúdo ünïcödé 🧠")
+        manager.add_article("Outra", "outra@example.com", "Notícias", "Título", "texto")
+        manager.compact()
+        manager.add_article("Autor", "autor@example.com", "Geral", "Depois", "do snapshot")
+        manager.close()
+
+        parsed = CatalogManager(self.filepath)
+        streamed = CatalogManager(self.filepath)
+        streamed.STREAM_THRESHOLD = 0
+        self.addCleanup(parsed.close)
+        self.addCleanup(streamed.close)
+
+        self.assertEqual(streamed.to_dict(), parsed.to_dict())
+        self.assertEqual(streamed._generation, parsed._generation)
+        self.assertEqual(len(streamed.list_articles()), 3)
+
+if __name__ == "__main__":
+    unittest.main()